@@ -0,0 +1,34 @@
+"""Process-wide settings, resolved once at import.
+
+Every module used to call load_dotenv() and os.getenv() itself, which both
+duplicated import-time work and risked defaults drifting apart. Import from
+here instead.
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+from helpers import require_env
+
+load_dotenv()
+
+URL_SHOPVOX = "https://express.shopvox.com"
+URL_SANMAR = "https://sanmar.com"
+URL_S_AND_S = "https://www.ssactivewear.com"
+
+TIMEOUT_MS_DEFAULT = int(os.getenv("SHOPVOX_TIMEOUT_MS", "5000"))
+
+SHOPVOX_EMAIL = require_env("SHOPVOX_EMAIL")
+SHOPVOX_PASSWORD = require_env("SHOPVOX_PASSWORD")
+
+SANMAR_USERNAME = require_env("SANMAR_USERNAME")
+SANMAR_PASSWORD = require_env("SANMAR_PASSWORD")
+
+S_AND_S_USERNAME = require_env("S_AND_S_USERNAME")
+S_AND_S_PASSWORD = require_env("S_AND_S_PASSWORD")
+
+USER_DATA_DIR = require_env("PW_USER_DATA_DIR")
+HEADLESS = require_env("PW_HEADLESS").lower() != "false"
+
+PAGE_POOL_SIZE = int(os.getenv("PW_POOL_SIZE", "4"))
@@ -2,6 +2,11 @@ import os
 
 from playwright.async_api import Error, Locator, Page
 
+# Apply a list of (selector, value) pairs in one evaluate instead of a
+# scroll + fill round-trip pair per input. Implemented by the context init
+# script scripts/scrape_helpers.js.
+FILL_PLAN_JS = "plan => window.__svScrape.batchFill(plan)"
+
 
 async def _click_and_wait_domcontent(
     page: Page, locator: Locator, timeout: int = 15000
@@ -1,52 +1,82 @@
 import asyncio
-import datetime
+import itertools
 import os
 import re
-import tempfile
+import time
+import uuid
+from pathlib import Path
+import contextlib
 from contextlib import asynccontextmanager
 from typing import (Any, AsyncIterator, Awaitable, Callable, Dict, List,
                     Optional, Tuple, Union)
 
-from dotenv import load_dotenv
-from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException
-from fastapi.responses import FileResponse, JSONResponse
-from playwright.async_api import BrowserContext
+import aiofiles
+from fastapi import Depends, FastAPI, HTTPException, Response
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from playwright.async_api import Browser, BrowserContext
 from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import Page, Playwright
 from playwright.async_api import TimeoutError as PWTimeout
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, expect
 
 import s_and_s
 import sanmar
-from helpers import require_env
-from schemas import Item, JobFilters, JobFiltersModel, MfaBodyModel, SalesOrder
+from config import (HEADLESS, PAGE_POOL_SIZE, SANMAR_PASSWORD,
+                    SANMAR_USERNAME, SHOPVOX_EMAIL, SHOPVOX_PASSWORD,
+                    TIMEOUT_MS_DEFAULT, URL_SANMAR, URL_SHOPVOX,
+                    USER_DATA_DIR)
+from schemas import (Item, JobFilters, JobFiltersModel, MfaBodyModel,
+                     SalesOrder)
+
+# Optional: attach to an already-running Chromium (see run_browser.sh) instead
+# of launching one per process, so multiple workers share a single browser.
+CDP_ENDPOINT = os.getenv("PW_CDP_ENDPOINT")
+
+# Recycle the persistent context after this many pages / seconds so page-scoped
+# browser state does not pile up forever in one long-lived context.
+CONTEXT_MAX_PAGES = int(os.getenv("PW_CONTEXT_MAX_PAGES", "200"))
+CONTEXT_MAX_AGE_S = int(os.getenv("PW_CONTEXT_MAX_AGE_S", "3600"))
 
-load_dotenv()
+_pw: Playwright | None = None
+_ctx: BrowserContext | None = None
+_browser: Browser | None = None
+_cdp_browser: Browser | None = None
+_lock = asyncio.Lock()
 
-URL_SANMAR = "https://sanmar.com"
-URL_SHOPVOX = "https://express.shopvox.com"
+_pages_served = 0
+_busy_pages = 0
+_ctx_created_at = 0.0
+_pages_idle = asyncio.Event()
+_pages_idle.set()
 
-SHOPVOX_EMAIL = require_env("SHOPVOX_EMAIL")
-SHOPVOX_PASSWORD = require_env("SHOPVOX_PASSWORD")
 
-SANMAR_USERNAME = require_env("SANMAR_USERNAME")
-SANMAR_PASSWORD = require_env("SANMAR_PASSWORD")
+def _mark_busy():
+    """A handler checked a long-lived page out; hold off recycling."""
+    global _busy_pages
+    _busy_pages += 1
+    _pages_idle.clear()
 
-USER_DATA_DIR = require_env("PW_USER_DATA_DIR")
-HEADLESS = require_env("PW_HEADLESS").lower() != "false"
 
-_pw: Playwright | None = None
-_ctx: BrowserContext | None = None
-_lock = asyncio.Lock()
+def _mark_idle():
+    global _busy_pages
+    _busy_pages -= 1
+    if _busy_pages <= 0:
+        _pages_idle.set()
 
 
 SALES_REP_LINKS: Dict[str, str] = {
-    "colby": "jobs?view=b36878a1-bdda-4eed-94ab-e42b60ac7e15",
-    "courtney": "jobs?view=d2f04e58-5605-43ef-997c-4bc2b78db50f",
+    k.lower(): v
+    for k, v in {
+        "colby": "jobs?view=b36878a1-bdda-4eed-94ab-e42b60ac7e15",
+        "courtney": "jobs?view=d2f04e58-5605-43ef-997c-4bc2b78db50f",
+    }.items()
 }
 
+_HAS_CREDS = bool(SHOPVOX_EMAIL and SHOPVOX_PASSWORD)
+
+
 def _require_creds():
-    if not SHOPVOX_EMAIL or not SHOPVOX_PASSWORD:
+    if not _HAS_CREDS:
         raise HTTPException(
             status_code=400,
             detail="Missing SHOPVOX_EMAIL or SHOPVOX_PASSWORD in environment (.env)",
@@ -60,36 +90,53 @@ async def _safe_inner_text(locator, timeout: int = 250) -> Optional[str]:
         return None
 
 
+_RE_TAIL_TRIM = re.compile(r"[^\w\-]+$")
+_RE_ALNUM_DASH = re.compile(r"[A-Za-z0-9\-]+")
+_RE_NUMERIC_KEEP = re.compile(r"[^\d.\-]")
+_ROWS_RE = re.compile(r"(\d[\d,]*)")
+
+
 def _parse_part_code(product_line_text: Optional[str]) -> Optional[str]:
     if not product_line_text:
         return None
     if " - " in product_line_text:
         tail = product_line_text.split(" - ")[-1].strip()
-        return re.sub(r"[^\w\-]+$", "", tail)
-    m = re.findall(r"[A-Za-z0-9\-]+", product_line_text)
+        return _RE_TAIL_TRIM.sub("", tail)
+    m = _RE_ALNUM_DASH.findall(product_line_text)
     return m[-1] if m else product_line_text.strip()
 
 
+_CANONICAL_SIZES = {
+    "XSM": "XS", "X-SMALL": "XS",
+    "SM": "S", "SMALL": "S",
+    "MED": "M", "MEDIUM": "M",
+    "LG": "L", "LARGE": "L",
+    "XLG": "XL", "X-LARGE": "XL",
+    "XXL": "2XL", "2X-LARGE": "2XL",
+    "XXXL": "3XL", "3X-LARGE": "3XL",
+    "XXXXL": "4XL", "4X-LARGE": "4XL",
+    # one-size variants:
+    "OS": "ONE SIZE",
+    "OSFA": "ONE SIZE",
+    "ONE SIZE FITS ALL": "ONE SIZE",
+    "QTY": "qty",
+}
+_CANONICAL_PASSTHRU = frozenset(_CANONICAL_SIZES.values())
+
+_SIZE_ORDER = {
+    "XS": 1, "S": 2, "M": 3, "L": 4, "XL": 5, "2XL": 6, "3XL": 7, "4XL": 8,
+    "ONE SIZE": 100, "qty": 999,
+}
+
+
 def _normalize_size_label(label: str) -> str:
     if not label:
         return "qty"
-    u = label.strip().upper()
-    canonical = {
-        "XSM": "XS", "X-SMALL": "XS",
-        "SM": "S", "SMALL": "S",
-        "MED": "M", "MEDIUM": "M",
-        "LG": "L", "LARGE": "L",
-        "XLG": "XL", "X-LARGE": "XL",
-        "XXL": "2XL", "2X-LARGE": "2XL",
-        "XXXL": "3XL", "3X-LARGE": "3XL",
-        "XXXXL": "4XL", "4X-LARGE": "4XL",
-        # one-size variants:
-        "OS": "ONE SIZE",
-        "OSFA": "ONE SIZE",
-        "ONE SIZE FITS ALL": "ONE SIZE",
-        "QTY": "qty",
-    }
-    return canonical.get(u, u)
+    s = label.strip()
+    if s in _CANONICAL_PASSTHRU:
+        return s
+    u = s.upper()
+    return _CANONICAL_SIZES.get(u, u)
 def _normalize_key_text(s: str) -> str:
     return (s or "").strip()
 
@@ -100,7 +147,7 @@ def _to_float(s: Optional[str]) -> Optional[float]:
     if not ss:
         return None
     ss = ss.replace(",", "")
-    ss = re.sub(r"[^\d.\-]", "", ss)
+    ss = _RE_NUMERIC_KEEP.sub("", ss)
     try:
         return float(ss)
     except ValueError:
@@ -118,12 +165,11 @@ def _normalize_store(s: Optional[str]) -> str:
 
 
 
-def safe_remove(path: str):
-    """Safely remove temp file if it exists."""
+async def safe_remove(path: str):
+    """Remove a temp file off-loop; a missing file is not an error."""
     try:
-        if os.path.exists(path):
-            os.remove(path)
-    except Exception as e:
+        await asyncio.to_thread(Path(path).unlink, missing_ok=True)
+    except OSError as e:
         print(f"Cleanup failed for {path}: {e}")
 
 
@@ -133,38 +179,204 @@ CHROME_UA = (
     "Chrome/131.0.0.0 Safari/537.36"
 )
 
+# The scrapers only read text/attribute data, so these resource types are
+# pure wasted bytes on every navigation. Stylesheets stay enabled because the
+# ShopVox grid does not render without them. Set PW_BLOCK_ASSETS=0 to watch
+# fully rendered pages when debugging headful.
+BLOCK_ASSETS = os.getenv("PW_BLOCK_ASSETS", "1") != "0"
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# Analytics/tracker hosts none of the flows depend on; their scripts and
+# beacons only add network and render work on every navigation.
+BLOCKED_HOST_FRAGMENTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "connect.facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+)
+
+
+async def _block_assets(route):
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+        return
+    url = request.url
+    if any(host in url for host in BLOCKED_HOST_FRAGMENTS):
+        await route.abort()
+        return
+    await route.continue_()
+
+
+def _track_page(page: Page):
+    """Count pages opened on the context so we know when to recycle it.
+
+    The pool, auth tab and cached job views stay open for the process
+    lifetime, so recycling keys off checked-out (busy) pages — see
+    _mark_busy/_mark_idle — not off open-page counts.
+    """
+    global _pages_served
+    _pages_served += 1
+
+
+# Strong refs to in-flight popup-close tasks: the loop only keeps weak refs
+# to running tasks, so an untracked create_task result can be GC'd mid-flight
+# (and Python 3.11+ warns about it). Done tasks discard themselves.
+_popup_tasks: set = set()
+
+
+async def _close_popup(p: Page):
+    with contextlib.suppress(Exception):
+        if await p.opener() is not None:
+            await p.close()
+
+
+def _on_context_page(p: Page):
+    """Context-level popup closer, attached once instead of per-page."""
+    task = asyncio.create_task(_close_popup(p))
+    _popup_tasks.add(task)
+    task.add_done_callback(_popup_tasks.discard)
+
+
+# Injected into every context so the store-module evaluates can call the
+# pre-compiled window.__svScrape helpers instead of shipping JS source.
+_INIT_SCRIPT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "scripts", "scrape_helpers.js"
+)
+
+
+async def _launch_context() -> BrowserContext:
+    global _pages_served, _ctx_created_at, _cdp_browser
+    assert _pw is not None
+    if CDP_ENDPOINT:
+        _cdp_browser = await _pw.chromium.connect_over_cdp(CDP_ENDPOINT)
+        ctx = (
+            _cdp_browser.contexts[0]
+            if _cdp_browser.contexts
+            else await _cdp_browser.new_context(
+                viewport={"width": 1366, "height": 900},
+                locale="en-US",
+                timezone_id="America/Chicago",
+                user_agent=CHROME_UA,
+            )
+        )
+    else:
+        ctx = await _pw.chromium.launch_persistent_context(
+            user_data_dir=USER_DATA_DIR,
+            headless=HEADLESS,
+            # args=[
+            #     "--no-sandbox",
+            #     "--disable-dev-shm-usage",
+            # ],
+            channel="chrome",
+            viewport={"width": 1366, "height": 900},
+            locale="en-US",
+            timezone_id="America/Chicago",
+            user_agent=CHROME_UA,
+        )
+    # Attach on the context, once — per-page route handlers leak.
+    if BLOCK_ASSETS:
+        await ctx.route("**/*", _block_assets)
+    await ctx.add_init_script(path=_INIT_SCRIPT_PATH)
+    ctx.on("page", _track_page)
+    ctx.on("page", _on_context_page)
+    _pages_served = 0
+    _ctx_created_at = time.monotonic()
+    return ctx
+
+
+def _context_expired() -> bool:
+    if _ctx is None:
+        return False
+    if CDP_ENDPOINT:
+        # A shared CDP browser is owned by its sidecar; never recycle it here.
+        return False
+    if _pages_served >= CONTEXT_MAX_PAGES:
+        return True
+    return time.monotonic() - _ctx_created_at >= CONTEXT_MAX_AGE_S
+
+
+async def _recycle_context():
+    """
+    Close and relaunch the persistent context once its page/age budget is
+    spent. Waits for checked-out pages to be returned (bounded), drains the
+    long-lived pages that belong to the old context, and carries cookies
+    over so sessions survive the swap.
+    """
+    global _ctx, _page_pool, _auth_page
+    async with _lock:
+        if _ctx is None or not _context_expired():
+            return
+        try:
+            await asyncio.wait_for(_pages_idle.wait(), timeout=60)
+        except asyncio.TimeoutError:
+            pass
+        # The pool, auth tab and cached job views all live on the old
+        # context; close them here so no caller is handed a dead page, and
+        # let each rebuild lazily on the new context.
+        if _page_pool is not None:
+            pool, _page_pool = _page_pool, None
+            while not pool.empty():
+                with contextlib.suppress(Exception):
+                    await pool.get_nowait().close()
+        if _auth_page is not None:
+            with contextlib.suppress(Exception):
+                await _auth_page.close()
+            _auth_page = None
+        for view_path in list(_job_pages):
+            await _drop_job_page(view_path)
+        state = await _ctx.storage_state()
+        try:
+            await _ctx.close()
+        except Exception:
+            pass
+        _ctx = await _launch_context()
+        if state.get("cookies"):
+            await _ctx.add_cookies(state["cookies"])
+
+
 async def _init_playwright_and_context():
     """
     Internal: start Playwright and create a persistent context exactly once.
     """
     global _pw, _ctx
+    # Double-checked: after startup both are always set, so skip the lock on
+    # the hot path and re-check under it only during the startup race.
+    if _pw is not None and _ctx is not None:
+        return
     async with _lock:
         if _pw is None:
             _pw = await async_playwright().start()
         if _ctx is None:
-            _ctx = await _pw.chromium.launch_persistent_context(
-                user_data_dir=USER_DATA_DIR,
-                headless=HEADLESS,
-                # args=[
-                #     "--no-sandbox",
-                #     "--disable-dev-shm-usage",
-                # ],
-                channel="chrome",
-                viewport={"width": 1366, "height": 900},
-                locale="en-US",
-                timezone_id="America/Chicago",
-                user_agent=CHROME_UA,
-            )
+            _ctx = await _launch_context()
 
 
 async def _shutdown_playwright():
-    global _pw, _ctx
+    global _pw, _ctx, _browser, _cdp_browser, _page_pool
+    _page_pool = None
+    if _popup_tasks:
+        await asyncio.gather(*_popup_tasks, return_exceptions=True)
+    if _cdp_browser is not None:
+        try:
+            await _cdp_browser.close()
+        except Exception:
+            pass
+        _cdp_browser = None
+        _ctx = None
     if _ctx is not None:
         try:
             await _ctx.close()
         except Exception:
             pass
         _ctx = None
+    if _browser is not None:
+        try:
+            await _browser.close()
+        except Exception:
+            pass
+        _browser = None
     if _pw is not None:
         try:
             await _pw.stop()
@@ -176,17 +388,173 @@ async def _shutdown_playwright():
 async def get_ctx() -> BrowserContext:
     """
     Public helper: returns the long-lived persistent context.
-    Ensures it exists if called very early.
+    Ensures it exists if called very early and recycles it once its
+    page/age budget is exhausted.
     """
     if _ctx is None:
         await _init_playwright_and_context()
+    if _context_expired():
+        await _recycle_context()
     assert _ctx is not None
     return _ctx
 
 
+_page_pool: Optional[asyncio.Queue] = None
+
+
+async def _ensure_page_pool() -> asyncio.Queue:
+    global _page_pool
+    ctx = await get_ctx()
+    async with _lock:
+        if _page_pool is None:
+            pool: asyncio.Queue = asyncio.Queue()
+            for _ in range(PAGE_POOL_SIZE):
+                page = await ctx.new_page()
+                pool.put_nowait(page)
+            _page_pool = pool
+    return _page_pool
+
+
+@asynccontextmanager
+async def acquire_page() -> AsyncIterator[Page]:
+    """
+    Check a pre-warmed page out of the shared pool. The pool size doubles as
+    the concurrency cap; the page is blanked and returned on exit instead of
+    being torn down.
+    """
+    pool = await _ensure_page_pool()
+    while True:
+        try:
+            page = await asyncio.wait_for(pool.get(), timeout=1.0)
+            break
+        except asyncio.TimeoutError:
+            # A recycle may have drained this queue and swapped in a new
+            # one; nothing ever refills the old queue, so re-resolve the
+            # pool rather than waiting on it forever.
+            if _page_pool is not pool:
+                pool = await _ensure_page_pool()
+    try:
+        if page.is_closed():
+            ctx = await get_ctx()
+            page = await ctx.new_page()
+        _mark_busy()
+        try:
+            yield page
+        finally:
+            _mark_idle()
+    finally:
+        try:
+            await page.goto("about:blank")
+        except Exception:
+            pass
+        if _page_pool is pool:
+            pool.put_nowait(page)
+        else:
+            # A recycle drained the pool while this page was out; it
+            # belongs to the old context, so don't return it anywhere.
+            with contextlib.suppress(Exception):
+                await page.close()
+
+
+_auth_page: Optional[Page] = None
+_auth_lock = asyncio.Lock()
+
+
+async def _get_auth_page() -> Page:
+    """
+    Dedicated page for the /login/shopvox endpoints. Kept in module state so
+    the MFA step lands on the same tab the sign-in form was filled on, instead
+    of whatever ctx.pages[0] happens to be. Recreated if context recycling
+    closed it. Callers must hold _auth_lock.
+    """
+    global _auth_page
+    ctx = await get_ctx()
+    if _auth_page is None or _auth_page.is_closed():
+        _auth_page = await ctx.new_page()
+    return _auth_page
+
+
+@asynccontextmanager
+async def _borrow_auth_page() -> AsyncIterator[Page]:
+    """
+    Serialize the /login endpoints on the shared auth tab and count it as
+    busy so context recycling waits for the flow instead of closing the tab
+    mid-sign-in.
+    """
+    async with _auth_lock:
+        page = await _get_auth_page()
+        _mark_busy()
+        try:
+            yield page
+        finally:
+            _mark_idle()
+
+
+async def _get_browser() -> Browser:
+    """Lazy plain (non-persistent) browser used for ephemeral order contexts."""
+    global _browser
+    async with _lock:
+        if _browser is None:
+            assert _pw is not None
+            _browser = await _pw.chromium.launch(
+                headless=HEADLESS,
+                channel="chrome",
+            )
+    return _browser
+
+
+async def new_order_context() -> BrowserContext:
+    """
+    Ephemeral context for one order, seeded with the persistent context's
+    cookies. Closing it reclaims all page-scoped browser memory, unlike pages
+    on the long-lived persistent context.
+    """
+    ctx = await get_ctx()
+    # Re-export on every call: the sessions rotate (and the /login endpoints
+    # re-establish them), so a boot-time snapshot would seed order runs with
+    # stale auth. Kept in memory — concurrent order workers sharing one
+    # on-disk file raced each other's non-atomic rewrites.
+    state = await ctx.storage_state()
+
+    browser = await _get_browser()
+    octx = await browser.new_context(
+        storage_state=state,
+        viewport={"width": 1366, "height": 900},
+        locale="en-US",
+        timezone_id="America/Chicago",
+        user_agent=CHROME_UA,
+    )
+    if BLOCK_ASSETS:
+        await octx.route("**/*", _block_assets)
+    await octx.add_init_script(path=_INIT_SCRIPT_PATH)
+    octx.on("page", _on_context_page)
+    return octx
+
+
+async def _warm_up():
+    """
+    Prime the fresh context at boot — network stack init, TLS handshake and
+    the SSO cookie dance happen here instead of on the first user request.
+    Best-effort: a dead network at startup should not stop the app.
+    """
+    with contextlib.suppress(Exception):
+        ctx = await get_ctx()
+        page = await ctx.new_page()
+        try:
+            await page.goto(
+                URL_SHOPVOX, wait_until="domcontentloaded",
+                timeout=TIMEOUT_MS_DEFAULT,
+            )
+        finally:
+            await page.close()
+    with contextlib.suppress(Exception):
+        await _ensure_page_pool()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     await _init_playwright_and_context()
+    await _warm_up()
     try:
         yield
     finally:
@@ -195,6 +563,34 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
 
 
+# Single-round-trip probes for the tag modal: each replaces a chain of
+# count()-gated locator fallbacks that cost one protocol round-trip apiece.
+_OPEN_TAG_DROPDOWN_JS = """
+(el) => {
+  const inds = el.querySelectorAll(
+    ".css-1xb41ip-indicatorContainer, [class*='indicatorContainer']"
+  );
+  if (inds.length) { inds[inds.length - 1].click(); return true; }
+  const combo = el.querySelector("[role='combobox']");
+  if (combo) { combo.click(); return true; }
+  return false;
+}
+"""
+
+_REMOVE_TAG_JS = """
+(el, badge) => {
+  const btns = [...el.querySelectorAll("[role='button'][aria-label^='Remove']")];
+  if (!btns.length) return false;
+  const inBadge = btns.find((b) => {
+    const holder = b.closest(".css-1rdcdvo-multiValue") || b.closest("div,span");
+    return holder && holder.innerText.includes(badge);
+  });
+  (inBadge || btns[0]).click();
+  return true;
+}
+"""
+
+
 async def clean_not_order_yet_tags(
     page: Page,
     orders: List[str],
@@ -202,20 +598,13 @@ async def clean_not_order_yet_tags(
     goto_timeout_ms: int = 45_000,
 ):
 
-    ctx = await get_ctx()
     BADGE_TEXT = "NOT ORDER YET"
 
     async def pick_ordered_and_submit(p: Page) -> None:
         modal = p.locator("#root-modals-dropdowns [role='dialog']").first
         await modal.wait_for(state="visible", timeout=10_000)
 
-        indicator = modal.locator(".css-1xb41ip-indicatorContainer, [class*='indicatorContainer']").last
-        if await indicator.count() > 0:
-            await indicator.click()
-        else:
-            combo = modal.get_by_role("combobox").first
-            if await combo.count() > 0:
-                await combo.click()
+        await modal.evaluate(_OPEN_TAG_DROPDOWN_JS)
 
         listbox = p.locator(
             "#react-select-2-listbox._options_y8hy2_13.intercom-target-select-field-options.css-uvrstl[role='listbox']"
@@ -249,9 +638,9 @@ async def clean_not_order_yet_tags(
         except Exception:
             pass
 
-        submit_btn = modal.locator("button.ml4.css-12lhddq").first
-        if await submit_btn.count() == 0:
-            submit_btn = modal.locator("button[type='submit']").first
+        submit_btn = modal.locator(
+            "button.ml4.css-12lhddq, button[type='submit']"
+        ).first
         await submit_btn.wait_for(state="visible", timeout=10_000)
         await submit_btn.click()
         await page.wait_for_timeout(5_000)
@@ -265,116 +654,113 @@ async def clean_not_order_yet_tags(
         modal = p.locator("#root-modals-dropdowns [role='dialog']").first
         await modal.wait_for(state="visible", timeout=10_000)
 
-        remove_btn = modal.locator(
-            f".css-1rdcdvo-multiValue:has-text('{BADGE_TEXT}') [role='button'][aria-label^='Remove']"
-        ).first
-        if await remove_btn.count() == 0:
-            remove_btn = modal.locator(
-                f":is(div, span):has-text('{BADGE_TEXT}') >> [role='button'][aria-label^='Remove']"
-            ).first
-        if await remove_btn.count() == 0:
-            remove_btn = modal.locator("[role='button'][aria-label^='Remove']").first
-        if await remove_btn.count() > 0:
-            await remove_btn.click()
-
-        indicator = modal.locator(".css-1xb41ip-indicatorContainer").last
-        if await indicator.count() == 0:
-            indicator = modal.locator("[class*='indicatorContainer']").last
-        if await indicator.count() > 0:
-            await indicator.click()
-        else:
-            combo = modal.locator("[role='combobox']").first
-            if await combo.count() > 0:
-                await combo.click()
+        await modal.evaluate(_REMOVE_TAG_JS, BADGE_TEXT)
+        await modal.evaluate(_OPEN_TAG_DROPDOWN_JS)
 
         await pick_ordered_and_submit(p)
 
 
-    async def run_one(idx: int, order: str, sem: asyncio.Semaphore):
-        async with sem:
-            page = await ctx.new_page()
-            page.on("popup", lambda p: asyncio.create_task(p.close()))
+    async def run_one(idx: int, order: str):
+        octx = await new_order_context()
+        try:
+            page = await octx.new_page()
             await page.goto(order, wait_until="domcontentloaded", timeout=goto_timeout_ms)
-            await page.wait_for_load_state("load")
             await tag_cleanup_on_order_page(page)
+        finally:
+            await octx.close()
 
-            await page.close()
+    # Fixed worker pool: only max_concurrency coroutines exist at a time,
+    # instead of eagerly scheduling one task per order.
+    queue: asyncio.Queue = asyncio.Queue()
+    for i, o in enumerate(orders):
+        queue.put_nowait((i, o))
+
+    async def worker():
+        while True:
+            try:
+                idx, order = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await run_one(idx, order)
 
-    sem = asyncio.Semaphore(max_concurrency)
-    tasks = [asyncio.create_task(run_one(i, o, sem)) for i, o in enumerate(orders)]
-    await asyncio.gather(*tasks, return_exceptions=False)
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(min(max_concurrency, len(orders))):
+            tg.create_task(worker())
 
 
-async def add_to_cart(orders: List["SalesOrder"], max_concurrency: int = 3):
-    STORE_HOMES: Dict[str, Callable[[Page], Awaitable[None]]] = {
-        "sanmar": sanmar.home,
-        "s&s activewear": s_and_s.home,
-    }
+_STORE_HOMES: Dict[str, Callable[[Page], Awaitable[None]]] = {
+    "sanmar": sanmar.home,
+    "s&s activewear": s_and_s.home,
+}
 
-    STORE_PROCESSORS: Dict[str, Callable[[Page, Item], Awaitable[Tuple[bool, List[str]]]]] = {
-        "sanmar": sanmar.process_item,
-        "s&s activewear":s_and_s.process_item,
-    }
+_STORE_PROCESSORS: Dict[str, Callable[[Page, Item], Awaitable[Tuple[bool, List[str]]]]] = {
+    "sanmar": sanmar.process_item,
+    "s&s activewear": s_and_s.process_item,
+}
 
-    ctx = await get_ctx()
 
-    async def process_order(order: SalesOrder, sem: asyncio.Semaphore, ctx) -> Dict:
-        order.items.sort(key=lambda it: (it.store).lower(), reverse=True)
+async def add_to_cart(orders: List["SalesOrder"], max_concurrency: int = 3):
+    async def process_order(order: SalesOrder) -> Dict:
+        # Items are sorted on the grouping key, so one groupby pass builds
+        # the per-store buckets (sanmar first, matching the old ordering).
+        order.items.sort(key=lambda it: _normalize_store(it.store), reverse=True)
 
-        page = await ctx.new_page()
-        page.on("popup", lambda p: asyncio.create_task(p.close()))
+        octx = await new_order_context()
 
         all_out_of_stock: Dict[str, List[str]] = {}
         skipped_custom: List[Dict[str, str]] = []
         processed_items: List[Dict[str, str]] = []
         any_added_overall = False
 
-        by_store: Dict[str, List[Item]] = {}
-        for it in order.items:
-            by_store.setdefault(_normalize_store(it.store), []).append(it)
-
-        # sanmar_key = "sanmar"
-        # s_and_s_key = "s&s activewear"
-        #
-        # sanmar_items = by_store.get(sanmar_key, [])
-        # s_and_s_items = by_store.get(s_and_s_key, [])
+        by_store: Dict[str, List[Item]] = {
+            k: list(g)
+            for k, g in itertools.groupby(order.items, key=lambda it: _normalize_store(it.store))
+        }
 
         has_custom = False
 
-        await page.set_viewport_size({"width": 1366, "height": 900})
-        await page.context.set_extra_http_headers({"Accept-Language": "en-US,en;q=0.9"})
-        processed_any = bool(processed_items) 
-        async with sem:
-            try:
-                for store_key, group in by_store.items():
-
+        await octx.set_extra_http_headers({"Accept-Language": "en-US,en;q=0.9"})
+        processed_any = bool(processed_items)
 
-                    processor = STORE_PROCESSORS.get(store_key)
-                    home = STORE_HOMES.get(store_key)
+        async def do_store(store_key: str, group: List[Item]):
+            nonlocal any_added_overall
 
-                    if home:
-                        await home(page)
+            processor = _STORE_PROCESSORS.get(store_key)
+            home = _STORE_HOMES.get(store_key)
+            if not processor:
+                return
 
-                    if processor:
-                        for it in group:
-                            if _normalize_store(it.store) == "custom":
-                                skipped_custom.append(
-                                    {"part": it.part, "color": it.color, "store": it.store}
-                                )
-                                continue
+            page = await octx.new_page()
+            try:
+                if home:
+                    await home(page)
 
-                            added_any, oos_sizes = await processor(page, it)
+                for it in group:
+                    if _normalize_store(it.store) == "custom":
+                        skipped_custom.append(
+                            {"part": it.part, "color": it.color, "store": it.store}
+                        )
+                        continue
 
-                            if oos_sizes:
-                                all_out_of_stock[it.part] = oos_sizes
-                            if added_any:
-                                any_added_overall = True
+                    added_any, oos_sizes = await processor(page, it)
 
-                            processed_items.append({"part": it.part, "color": it.color })
+                    if oos_sizes:
+                        all_out_of_stock[it.part] = oos_sizes
+                    if added_any:
+                        any_added_overall = True
 
+                    processed_items.append({"part": it.part, "color": it.color })
             finally:
-                if page:
-                    await page.close()
+                await page.close()
+
+        try:
+            # Each store runs on its own page so SanMar and S&S navigate
+            # concurrently; wall clock is the slowest store, not the sum.
+            await asyncio.gather(
+                *(do_store(k, g) for k, g in by_store.items())
+            )
+        finally:
+            await octx.close()
 
         has_oos = bool(all_out_of_stock)
         has_custom = bool(skipped_custom)
@@ -414,9 +800,25 @@ async def add_to_cart(orders: List["SalesOrder"], max_concurrency: int = 3):
             },
         }
 
-    sem = asyncio.Semaphore(max_concurrency)
-    tasks = [asyncio.create_task(process_order(order, sem, ctx)) for order in orders]
-    return await asyncio.gather(*tasks, return_exceptions=False)
+    results: List[Optional[Dict]] = [None] * len(orders)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for i, order in enumerate(orders):
+        queue.put_nowait((i, order))
+
+    async def worker():
+        while True:
+            try:
+                idx, order = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            results[idx] = await process_order(order)
+
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(min(max_concurrency, len(orders))):
+            tg.create_task(worker())
+
+    return results
 
     
     async def process_order(order: "SalesOrder", sem: asyncio.Semaphore):
@@ -427,7 +829,6 @@ async def add_to_cart(orders: List["SalesOrder"], max_concurrency: int = 3):
             has_sanmar = any(((it.store).strip().casefold() == "sanmar") for it in order.items)
 
             page = await ctx.new_page()
-            page.on("popup", lambda p: asyncio.create_task(p.close()))
             if has_sanmar:
                 await goto_home(page)
 
@@ -519,22 +920,36 @@ async def get_sales_orders_urls(page: Page):
 
     await rows.first.wait_for(state="visible", timeout=15_000)
 
-    seen = -1
-    stable = 0
-    while True:
-        count = await rows.count()
-        if count == seen:
-            stable += 1
-        else:
-            stable = 0
-            seen = count
-        if stable >= 2:
-            break
-        try:
-            await content.evaluate("el => el.scrollBy(0, el.scrollHeight)")
-        except Exception:
-            await page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
-        await page.wait_for_timeout(200)
+    # Scroll until the virtualized list stops growing. A MutationObserver in
+    # the page re-scrolls on every batch of new rows and resolves once no
+    # mutations arrive for 300ms, so we pay one round-trip instead of polling.
+    try:
+        await content.evaluate(
+            """
+            (el) => new Promise((resolve) => {
+              let done = false;
+              let timer = null;
+              const settle = (obs) => {
+                if (done) return;
+                done = true;
+                obs.disconnect();
+                resolve();
+              };
+              const obs = new MutationObserver(() => kick());
+              const kick = () => {
+                el.scrollBy(0, el.scrollHeight);
+                if (timer) clearTimeout(timer);
+                timer = setTimeout(() => settle(obs), 300);
+              };
+              obs.observe(el, { childList: true, subtree: true });
+              kick();
+              setTimeout(() => settle(obs), 10000);
+            })
+            """
+        )
+    except Exception:
+        await page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
+        await page.wait_for_timeout(400)
 
     total_rows = await rows.count()
 
@@ -565,8 +980,67 @@ async def get_sales_orders_urls(page: Page):
     return sos
 
 
+# Reads every line-item card in one DOM traversal so Python does a single
+# evaluate round-trip instead of several locator calls per card/size row.
+_EXTRACT_CARDS_JS = """
+() => {
+  const txt = (el) => (el ? el.innerText.trim() : "");
+
+  let cards = [...document.querySelectorAll("div.bg-white")].filter((c) =>
+    c.querySelector("[class*='_apparelItemPricingDescriptionItemName_']")
+  );
+  if (cards.length === 0) {
+    cards = [...document.querySelectorAll("div.bg-white.borderRadius-8.p8")];
+  }
+  if (cards.length === 0) {
+    cards = [...document.querySelectorAll("div.bg-white")];
+  }
+
+  return cards.map((card) => {
+    const desc = card.querySelector(
+      "[class*='_apparelItemPricingDescriptionItemName_']"
+    );
+    let store = "", name = "", color = "";
+    if (desc) {
+      store = txt(desc.querySelector("p.css-i7pnfr:not(.mt4)"));
+      name = txt(desc.querySelector("p.mt4.css-i7pnfr"));
+      color = txt(desc.querySelector("p.css-ifbqr7"));
+    } else {
+      name = txt(card.querySelector("[class^='_lineItemPreviewName_'] p.css-i7pnfr"));
+      store = txt(card.querySelector("p.css-i7pnfr:not(.mt4)")) || "Custom";
+      color = txt(card.querySelector("p.css-ifbqr7"));
+    }
+
+    const rows = [
+      ...card.querySelectorAll(
+        "div._apparelItemSizesPricing_tgx96_24 > div.PricingTemplateApparelItemsItemSizesSize"
+      ),
+    ];
+    const sizes = [];
+    if (rows.length === 0) {
+      const qty = card.querySelector(
+        "input[name*='.quantity'], input#quantity-input, input[name='quantity']"
+      );
+      if (qty) sizes.push({ label: "qty", value: qty.value });
+    } else {
+      for (const r of rows) {
+        const label = txt(
+          r.querySelector("div._apparelItemSizesPricingLabel_tgx96_30")
+        );
+        const input = r.querySelector("input[type='text']");
+        sizes.push({ label, value: input ? input.value : "" });
+      }
+    }
+    return { store, name, color, hasRows: rows.length > 0, sizes };
+  });
+}
+"""
+
+
 async def extract_line_items(page) -> List[Dict[str, Any]]:
-    line_items: List[Dict[str, Any]] = []
+    # Buckets keyed by (part, color, store); filled while walking the cards
+    # so there is no intermediate flat list to re-traverse.
+    merged: Dict[tuple, Dict[str, Any]] = {}
 
     # 1) Find the items area (virtualized container) or fallbacks
     items_container = page.locator("[class^='_lineItemPreview_']").first
@@ -610,98 +1084,44 @@ async def extract_line_items(page) -> List[Dict[str, Any]]:
                 pass
         await page.wait_for_timeout(200)
 
-    # 3) CARD selection: prefer apparel description cards; fallback to generic white cards
-    cards = page.locator("div.bg-white:has([class*='_apparelItemPricingDescriptionItemName_'])")
-    if await cards.count() == 0:
-        cards = page.locator("div.bg-white.borderRadius-8.p8")
-    if await cards.count() == 0:
-        cards = page.locator("div.bg-white")
-
-    ccount = await cards.count()
-    for i in range(ccount):
-        card = cards.nth(i)
-
-        # Apparel layout?
-        desc_block = card.locator("[class*='_apparelItemPricingDescriptionItemName_']").first
-        is_apparel = (await desc_block.count()) > 0
-
-        store = name_text = color = part = ""
-
-        if is_apparel:
-            store_p = desc_block.locator("p.css-i7pnfr:not(.mt4)").first
-            name_p  = desc_block.locator("p.mt4.css-i7pnfr").first
-            color_p = desc_block.locator("p.css-ifbqr7").first
+    # 3) CARD extraction: one evaluate reads every card's text/inputs at once
+    try:
+        cards = await page.evaluate(_EXTRACT_CARDS_JS)
+    except Exception:
+        cards = []
 
-            name_text = (await _safe_inner_text(name_p)) or ""
-            color     = (await _safe_inner_text(color_p)) or ""
-            store     = (await _safe_inner_text(store_p)) or ""
-            part      = _parse_part_code(name_text) or ""
-        else:
-            # Generic line item preview
-            name_p = card.locator("[class^='_lineItemPreviewName_'] p.css-i7pnfr").first
-            name_text = (await _safe_inner_text(name_p)) or ""
-            part = _parse_part_code(name_text) or ""
-            store = (await _safe_inner_text(card.locator("p.css-i7pnfr:not(.mt4)").first)) or "Custom"
-            color = (await _safe_inner_text(card.locator("p.css-ifbqr7").first)) or ""
-
-        # SIZE rows (apparel) or single quantity input (non-apparel)
-        size_rows_loc = card.locator(
-            "div._apparelItemSizesPricing_tgx96_24 > div.PricingTemplateApparelItemsItemSizesSize"
-        )
+    for card in cards:
+        name_text = card.get("name") or ""
+        part = _parse_part_code(name_text) or ""
+        store = card.get("store") or ""
+        color = card.get("color") or ""
 
         sizes_list: List[Dict[str, Any]] = []
-        total_qty_for_card = 0.0
-        rcount = await size_rows_loc.count()
 
-        if rcount == 0:
-            # Non-apparel: one quantity input
-            qty_input = card.locator(
-                "input[name*='.quantity'], input#quantity-input, input[name='quantity']"
-            ).first
-            qty_val_opt = await _safe_input_value(qty_input)
-            qty_val = _to_float(qty_val_opt) or 0.0
-            if qty_val > 0:
-                sizes_list.append({"size": "qty", "quantity": float(qty_val)})
-                total_qty_for_card += float(qty_val)
+        if card.get("hasRows"):
+            for s in card.get("sizes", []):
+                qty_val = _to_float(s.get("value")) or 0.0
+                sizes_list.append({"size": s.get("label") or "", "quantity": float(qty_val)})
         else:
-            for j in range(rcount):
-                size_row = size_rows_loc.nth(j)
-                size_label = (
-                    await _safe_inner_text(size_row.locator("div._apparelItemSizesPricingLabel_tgx96_30").first)
-                ) or ""
-                qty_val_opt = await _safe_input_value(size_row.locator("input[type='text']").first)
-                qty_val = _to_float(qty_val_opt) or 0.0
-                sizes_list.append({"size": size_label, "quantity": float(qty_val)})
-                total_qty_for_card += float(qty_val)
+            # Non-apparel: one quantity input
+            for s in card.get("sizes", []):
+                qty_val = _to_float(s.get("value")) or 0.0
+                if qty_val > 0:
+                    sizes_list.append({"size": "qty", "quantity": float(qty_val)})
 
         if not sizes_list:
             # nothing to emit for this card
             continue
 
-        for s in sizes_list:
-            line_items.append(
-                {
-                    "name": name_text,
-                    "part": part,
-                    "color": color,
-                    "store": store or "Custom",
-                    "size": s["size"],
-                    "quantity": float(s["quantity"]),
-                }
-            )
-
-    # 4) Merge by (part, color, store) and SUM per-size quantities (dedupe sizes)
-    merged: Dict[tuple, Dict[str, Any]] = {}
-
-    for item in line_items:
-        part_key  = _normalize_key_text(item.get("part", ""))
-        color_key = _normalize_key_text(item.get("color", ""))
-        store_key = _normalize_key_text(item.get("store", "Custom"))
+        # 4) Merge by (part, color, store) and SUM per-size quantities
+        part_key  = _normalize_key_text(part)
+        color_key = _normalize_key_text(color)
+        store_key = _normalize_key_text(store or "Custom")
 
         key = (part_key, color_key, store_key)
         if key not in merged:
             merged[key] = {
-                "name": item.get("name", ""),
+                "name": name_text,
                 "part": part_key,
                 "color": color_key,
                 "store": store_key or "Custom",
@@ -711,38 +1131,33 @@ async def extract_line_items(page) -> List[Dict[str, Any]]:
             }
 
         bucket = merged[key]
-        size_label = _normalize_size_label(item.get("size", "") or "")
-        qty = float(item.get("quantity") or 0.0)
+        for s in sizes_list:
+            size_label = _normalize_size_label(s["size"] or "")
+            qty = float(s["quantity"] or 0.0)
 
-        prev = float(bucket["_sizes_map"].get(size_label, 0.0))
-        bucket["_sizes_map"][size_label] = prev + qty
-        bucket["total_quantity"] = float(bucket["total_quantity"]) + qty
+            prev = float(bucket["_sizes_map"].get(size_label, 0.0))
+            bucket["_sizes_map"][size_label] = prev + qty
+            bucket["total_quantity"] = float(bucket["total_quantity"]) + qty
 
     # 5) Finalize output (convert _sizes_map to sorted list)
-    def _size_sort_key(s: Dict[str, Any]) -> int:
-        order = {
-            "XS": 1, "S": 2, "M": 3, "L": 4, "XL": 5, "2XL": 6, "3XL": 7, "4XL": 8,
-            "ONE SIZE": 100, "qty": 999,
-        }
-        return order.get(s["size"], 50)
-
     result: List[Dict[str, Any]] = []
     for v in merged.values():
         v["total_quantity"] = float(round(float(v["total_quantity"]), 2))
 
-        sizes: List[Dict[str, Any]] = []
-        for sz, q in v["_sizes_map"].items():
-            sizes.append({"size": sz, "quantity": float(round(float(q), 2))})
-        sizes.sort(key=_size_sort_key)
-
-        v["sizes"] = sizes
+        v["sizes"] = sorted(
+            (
+                {"size": sz, "quantity": float(round(float(q), 2))}
+                for sz, q in v["_sizes_map"].items()
+            ),
+            key=lambda s: _SIZE_ORDER.get(s["size"], 50),
+        )
         v.pop("_sizes_map", None)
         result.append(v)
 
     return result
 
 async def get_so_details_parallel(
-    page: Page,
+    ctx: BrowserContext,
     sos: List[dict],
     max_concurrency: int = 8,
     wait_ms_between_starts: int = 100,
@@ -758,187 +1173,320 @@ async def get_so_details_parallel(
     if total == 0:
         return results
 
-    ctx = page.context
-    sem = asyncio.Semaphore(max_concurrency)
-
-    async def fetch_one(idx: int, so: dict):
+    async def fetch_one(p: Page, idx: int, so: dict):
         full_url = URL_SHOPVOX + so["href"]
-        async with sem:
-            if wait_ms_between_starts > 0:
-                await asyncio.sleep(wait_ms_between_starts / 1000)
+        items = []
 
-            p = await ctx.new_page()
-            items = []
+        for _ in range(4):
+            await p.goto(full_url, wait_until="domcontentloaded")
+            try:
+                await p.wait_for_selector(
+                    "h2.css-ycj89q:has-text('Items')", timeout=15_000
+                )
+                # Wait for the item cards themselves instead of sleeping a
+                # fixed 5s; only retry the navigation when they never show.
+                await p.wait_for_function(
+                    "() => document.querySelectorAll("
+                    "'.PricingTemplateApparelItemsItemSizesSize input,"
+                    " [class^=_lineItemPreviewName_]'"
+                    ").length > 0",
+                    timeout=15_000,
+                )
+            except PWTimeout:
+                continue
 
-            for _ in range(4):
-                await p.goto(full_url, wait_until="domcontentloaded")
-                await p.wait_for_selector("h2.css-ycj89q:has-text('Items')", timeout=15_000)
-                await page.wait_for_timeout(5000)
+            items = await extract_line_items(p)
 
-                items = await extract_line_items(p)
+            if len(items) > 0:
+                break
 
-                if len(items) > 0:
-                    break
 
+        results[idx] = {
+            "url": full_url,
+            "id": so["id"],
+            "customer": so['customer'],
+            "items": items,
+            "total": sum(i.get("total_quantity", 0) or 0 for i in items),
+        }
 
-            results[idx] = {
-                "url": full_url,
-                "id": so["id"],
-                "customer": so['customer'],
-                "items": items,
-                "total": sum(i.get("total_quantity", 0) or 0 for i in items),
-            }
+    queue: asyncio.Queue = asyncio.Queue()
+    for i, so in enumerate(sos):
+        queue.put_nowait((i, so))
+
+    async def worker(slot: int):
+        # Stagger worker starts so K tabs don't all hit the server at once,
+        # then keep one page per worker for the whole drain instead of a
+        # new-page/close cycle per SO.
+        if wait_ms_between_starts > 0:
+            await asyncio.sleep(slot * wait_ms_between_starts / 1000)
+        p = await ctx.new_page()
+        try:
+            while True:
+                try:
+                    idx, so = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await fetch_one(p, idx, so)
+        finally:
             await p.close()
 
-    tasks = [asyncio.create_task(fetch_one(i, so)) for i, so in enumerate(sos)]
-    await asyncio.gather(*tasks, return_exceptions=False)
+    async with asyncio.TaskGroup() as tg:
+        for slot in range(min(max_concurrency, total)):
+            tg.create_task(worker(slot))
+
     return results
 
 
-async def fetch_overdue_jobs() -> Union[str, dict]:
+# Jobs-view pages kept navigated between export requests so repeat calls skip
+# the new-page + goto cost; entries are recreated after a TTL to avoid letting
+# one tab accumulate state forever.
+JOB_PAGE_TTL_S = int(os.getenv("PW_JOB_PAGE_TTL_S", "300"))
+
+_job_pages: Dict[str, Tuple[Page, float]] = {}
+
+
+async def _wait_rows_count(page: Page, timeout: int = 15_000):
+    """Wait until the grid's rows counter has rendered an actual number."""
+    count_loc = page.locator("p.css-ifbqr7").first
+    await expect(count_loc).to_be_visible(timeout=timeout)
+    await expect(count_loc).to_have_text(re.compile(r"\d[\d,]*"), timeout=timeout)
+
+
+async def _get_job_page(view_path: str) -> Page:
     """
-    Navigates to Jobs view and downloads the exported PDF.
-    Returns:
-      - str: path to saved PDF on success
-      - dict: {"error": "..."} on failure
+    Return a page already sitting on the given jobs view, reusing a pooled
+    one when it is still fresh.
     """
-
     ctx = await get_ctx()
-    page = await ctx.new_page()
-    page.on("popup", lambda p: asyncio.create_task(p.close()))
-
-    try:
+    now = time.monotonic()
+
+    entry = _job_pages.get(view_path)
+    if entry:
+        page, born = entry
+        if not page.is_closed() and now - born < JOB_PAGE_TTL_S:
+            await page.reload(wait_until="commit")
+            await page.locator("span:has-text('Jobs')").wait_for(state="visible")
+            await _wait_rows_count(page)
+            return page
+        _job_pages.pop(view_path, None)
+        if not page.is_closed():
+            try:
+                await page.close()
+            except Exception:
+                pass
 
-        await page.goto(URL_SHOPVOX + "/jobs?view=f60b58c5-eb32-461b-9fed-05d6ac6d9ce3")
-        await page.locator("span:has-text('Jobs')").wait_for(state="visible")
-        await page.wait_for_timeout(10000)
+    page = await ctx.new_page()
+    # "commit" returns as soon as navigation starts; the targeted waits
+    # below are the real readiness gate, so nothing heavier is needed.
+    await page.goto(
+        URL_SHOPVOX + "/" + view_path.lstrip("/"), wait_until="commit"
+    )
+    await page.locator("span:has-text('Jobs')").wait_for(state="visible")
+    await _wait_rows_count(page)
+    _job_pages[view_path] = (page, now)
+    return page
 
-        rows_count_text = await page.locator("p.css-ifbqr7").inner_text()
-        m = re.search(r"(\d[\d,]*)", rows_count_text)
-        rows_count = int(m.group(1).replace(",", "")) if m else None
 
-        if rows_count == 0:
+async def _drop_job_page(view_path: str):
+    entry = _job_pages.pop(view_path, None)
+    if entry:
+        page, _ = entry
+        try:
             await page.close()
-            return ""
+        except Exception:
+            pass
 
-        await page.locator("button.css-obi7n2").click()
-        await page.locator("div.display-b.textDecoration-n.cursor-p.text-black").nth(
-            1
-        ).click()
 
-        async with page.expect_download() as download_info:
-            await page.locator("button.css-xdirqf").click()
-        download = await download_info.value
+# The export dialog's download button. It currently shares the generated
+# css-xdirqf class with the sign-in button, but the two flows are unrelated —
+# keep separate selectors so a restyle of one cannot break the other.
+EXPORT_DOWNLOAD_BTN_SEL = "button.css-xdirqf"
 
-        tmp_dir = tempfile.gettempdir()
-        pdf_path = os.path.join(tmp_dir, download.suggested_filename)
-        await download.save_as(pdf_path)
-        await page.close()
 
-        return pdf_path
+async def _export_jobs_pdf(page: Page) -> Union[Tuple[str, str], str]:
+    """
+    Read the rows count and download the exported PDF.
+    Returns (path, suggested_filename), or '' when the view has no rows.
+    The path is Playwright's own download file; no extra copy is made.
+    """
+    # The rows counter and the export button live in independent subtrees,
+    # so read one while the other's actionability check runs. The menu item
+    # click stays sequential: it only exists after the menu opens.
+    export_btn = page.locator("button.css-obi7n2")
+    rows_count_text, _ = await asyncio.gather(
+        page.locator("p.css-ifbqr7").inner_text(),
+        export_btn.wait_for(state="visible"),
+    )
+    m = _ROWS_RE.search(rows_count_text)
+    rows_count = int(m.group(1).replace(",", "")) if m else None
 
-    except PlaywrightError as e:
-        await page.close()
+    if rows_count == 0:
+        return ""
 
-        return {"error": f"Playwright error: {str(e)}"}
-    except Exception as e:
-        await page.close()
+    await export_btn.click()
+    await page.locator("div.display-b.textDecoration-n.cursor-p.text-black").nth(
+        1
+    ).click()
 
-        return {"error": f"Unexpected error: {str(e)}"}
+    async with page.expect_download() as download_info:
+        await page.locator(EXPORT_DOWNLOAD_BTN_SEL).click()
+    download = await download_info.value
 
+    pdf_path = str(await download.path())
+    return pdf_path, download.suggested_filename
 
-async def fetch_pending_jobs(filters: JobFilters) -> Union[str, dict]:
-    ctx = await get_ctx()
-    page = await ctx.new_page()
-    page.on("popup", lambda p: asyncio.create_task(p.close()))
 
+async def _stream_and_remove(path: str, chunk_size: int = 64 * 1024):
+    """Yield the file in chunks and delete it once the response is sent."""
     try:
+        async with aiofiles.open(path, "rb") as f:
+            while chunk := await f.read(chunk_size):
+                yield chunk
+    finally:
+        await safe_remove(path)
 
-        sales_rep = filters.get("sales_rep")
-        rep_link = None
-
-        if sales_rep:
-            key = sales_rep.strip().lower()
-            rep_link = SALES_REP_LINKS.get(key)
-            if rep_link is None:
-                return {
-                    "error": f"Unknown sales_rep '{sales_rep}'. "
-                    f"Allowed: {', '.join(SALES_REP_LINKS.keys())}"
-                }
-
-            await page.goto(URL_SHOPVOX + "/" + rep_link)
-        await page.locator("span:has-text('Jobs')").wait_for(state="visible")
-        await page.wait_for_timeout(10000)
 
-        rows_count_text = await page.locator("p.css-ifbqr7").inner_text()
-        m = re.search(r"(\d[\d,]*)", rows_count_text)
-        rows_count = int(m.group(1).replace(",", "")) if m else None
+OVERDUE_JOBS_VIEW = "jobs?view=f60b58c5-eb32-461b-9fed-05d6ac6d9ce3"
 
-        if rows_count == 0:
-            await page.close()
-            return ""
 
-        await page.locator("button.css-obi7n2").click()
-        await page.locator("div.display-b.textDecoration-n.cursor-p.text-black").nth(
-            1
-        ).click()
+class ScrapeError(HTTPException):
+    """An export run failed; FastAPI serializes this like the old error dict."""
 
-        async with page.expect_download() as download_info:
-            await page.locator("button.css-xdirqf").click()
-        download = await download_info.value
+    def __init__(self, detail: str, status_code: int = 500):
+        super().__init__(status_code=status_code, detail=detail)
 
-        tmp_dir = tempfile.gettempdir()
-        pdf_path = os.path.join(tmp_dir, download.suggested_filename)
-        await download.save_as(pdf_path)
-        await page.close()
 
-        return pdf_path
+async def fetch_overdue_jobs() -> Union[Tuple[str, str], str]:
+    """
+    Navigates to Jobs view and downloads the exported PDF.
+    Returns (path, filename) on success ('' when the view has no rows);
+    raises ScrapeError on failure.
+    """
+    try:
+        page = await _get_job_page(OVERDUE_JOBS_VIEW)
+        _mark_busy()
+        try:
+            return await _export_jobs_pdf(page)
+        finally:
+            _mark_idle()
 
     except PlaywrightError as e:
-        await page.close()
-
-        return {"error": f"Playwright error: {str(e)}"}
+        await _drop_job_page(OVERDUE_JOBS_VIEW)
+        raise ScrapeError(f"Playwright error: {str(e)}")
     except Exception as e:
-        await page.close()
-
-        return {"error": f"Unexpected error: {str(e)}"}
+        await _drop_job_page(OVERDUE_JOBS_VIEW)
+        raise ScrapeError(f"Unexpected error: {str(e)}")
 
 
-async def fetch_to_order_so():
-    ctx = await get_ctx()
-    page = await ctx.new_page()
-    page.on("popup", lambda p: asyncio.create_task(p.close()))
+async def fetch_pending_jobs(filters: JobFilters) -> Union[Tuple[str, str], str]:
+    sales_rep = filters.get("sales_rep")
+    rep_link = None
 
-    try:
-        await page.goto(
-            URL_SHOPVOX
-            + "/transactions/sales-orders?view=2225c6de-1500-414d-b393-1d0a5b098fef"
-        )
-        await page.locator("span:has-text('Sales Orders')").wait_for(state="visible")
-        await page.wait_for_timeout(5000)
-        so_urls_full = await get_sales_orders_urls(page)
+    if sales_rep:
+        key = sales_rep.strip().lower()
+        rep_link = SALES_REP_LINKS.get(key)
+        if rep_link is None:
+            raise ScrapeError(
+                f"Unknown sales_rep '{sales_rep}'. "
+                f"Allowed: {', '.join(SALES_REP_LINKS.keys())}"
+            )
 
-        so_urls = [
-            {"href": u["href"], "id": u["id"], "customer": u['customer']}
-            for u in so_urls_full
-            if u.get("href") and u.get("id")
-        ]
+    if rep_link is None:
+        raise ScrapeError("Missing sales_rep filter")
 
-        result = await get_so_details_parallel(page, so_urls)
-        await page.close()
-        return result
+    try:
+        page = await _get_job_page(rep_link)
+        _mark_busy()
+        try:
+            return await _export_jobs_pdf(page)
+        finally:
+            _mark_idle()
 
     except PlaywrightError as e:
-        await page.close()
-
-        return {"error": f"Playwright error: {str(e)}"}
+        await _drop_job_page(rep_link)
+        raise ScrapeError(f"Playwright error: {str(e)}")
     except Exception as e:
-        await page.close()
+        await _drop_job_page(rep_link)
+        raise ScrapeError(f"Unexpected error: {str(e)}")
 
-        return {"error": f"Unexpected error: {str(e)}"}
 
+async def fetch_to_order_so():
+    async with acquire_page() as page:
+        try:
+            await page.goto(
+                URL_SHOPVOX
+                + "/transactions/sales-orders?view=2225c6de-1500-414d-b393-1d0a5b098fef",
+                wait_until="domcontentloaded",
+            )
+            await expect(
+                page.locator("span:has-text('Sales Orders')")
+            ).to_be_visible(timeout=15_000)
+            so_urls_full = await get_sales_orders_urls(page)
+
+            so_urls = [
+                {"href": u["href"], "id": u["id"], "customer": u['customer']}
+                for u in so_urls_full
+                if u.get("href") and u.get("id")
+            ]
+
+            return await get_so_details_parallel(page.context, so_urls)
+
+        except PlaywrightError as e:
+            return {"error": f"Playwright error: {str(e)}"}
+        except Exception as e:
+            return {"error": f"Unexpected error: {str(e)}"}
+
+
+# Inline-error selectors for the sign-in flow, unioned so one locator probe
+# replaces a per-selector round-trip loop.
+# Sign-in form selectors shared by /login and /login-mfa.
+EMAIL_SEL = "#email-input"
+PASSWORD_SEL = "#password-input"
+OTP_SEL = "#otpCode-input"
+SIGNIN_BTN_SEL = "button.css-xdirqf"
+
+# Matched by wait_for_url: any URL that no longer contains /sign-in. A
+# compiled pattern lets the driver test navigations without a Python
+# callback round-trip per URL change.
+_NOT_SIGN_IN_RE = re.compile(r"^(?!.*/sign-in).*$")
+
+# Visibility check and text read for the inline-error probes in one call;
+# locator.is_visible() + inner_text() costs two round-trips per probe.
+_VISIBLE_ERROR_JS = """
+sel => {
+    for (const el of document.querySelectorAll(sel)) {
+        const st = getComputedStyle(el);
+        if (st.display === 'none' || st.visibility === 'hidden') continue;
+        const text = (el.innerText || '').trim();
+        if (text) return text;
+    }
+    return null;
+}
+"""
+
+_LOGIN_ERROR_SELECTOR = ", ".join(
+    [
+        ".css-oto7dz",
+        "[data-testid='error'], .error, .alert-danger",
+        "#email-field-wrapper.field-has-error",
+        "#password-field-wrapper.field-has-error",
+    ]
+)
+
+_MFA_ERROR_SELECTOR = ", ".join(
+    [
+        ".css-oto7dz",
+        "[data-testid='error'], .error, .alert-danger",
+        "#otpCode-field-wrapper.field-has-error",
+    ]
+)
 
-app = FastAPI(title="ShopVox Scrape API", version="1", lifespan=lifespan)
+app = FastAPI(
+    title="ShopVox Scrape API",
+    version="1",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 
 @app.get("/login/shopvox")
@@ -954,67 +1502,86 @@ async def login():
     _require_creds()
 
     try:
-        ctx = await get_ctx()
-        page = ctx.pages[0] if ctx.pages else await ctx.new_page()
-        page.on("popup", lambda p: asyncio.create_task(p.close()))
-
-        await page.goto(
-            f"{URL_SHOPVOX}/sign-in", wait_until="domcontentloaded")
+        async with _borrow_auth_page() as page:
 
-        # Ensure sign-in form fields are visible
-        await page.locator("#email-input").wait_for(
-            state="visible")
-        await page.locator("#password-input").wait_for(
-            state="visible")
+            await page.goto(
+                f"{URL_SHOPVOX}/sign-in", wait_until="domcontentloaded")
 
-        # Fill credentials
-        await page.fill("#email-input", SHOPVOX_EMAIL)
-        await page.fill("#password-input", SHOPVOX_PASSWORD)
+            # The two fields are independent DOM nodes, so run their
+            # visibility waits — and then the fills — in parallel instead
+            # of paying four serialized round-trips.
+            await asyncio.gather(
+                page.locator(EMAIL_SEL).wait_for(state="visible"),
+                page.locator(PASSWORD_SEL).wait_for(state="visible"),
+            )
+            await asyncio.gather(
+                page.fill(EMAIL_SEL, SHOPVOX_EMAIL),
+                page.fill(PASSWORD_SEL, SHOPVOX_PASSWORD),
+            )
 
-        # Click Sign In WITHOUT expect_navigation (MFA keeps you on /sign-in)
-        await page.locator("button.css-xdirqf").click()
+            # Click Sign In WITHOUT expect_navigation (MFA keeps you on /sign-in)
+            await page.locator(SIGNIN_BTN_SEL).click()
 
-        # Fast-path: check if MFA code field is visible now
-        try:
-            await page.locator("#otpCode-input").wait_for(state="visible", timeout=5000)
-            return JSONResponse(
-                content={"status": "mfa_required", "message": "MFA code requested"},
-                status_code=202,
+            # Race the MFA field, the post-login redirect and the inline
+            # error banner so whichever signal renders first decides the
+            # response instead of always paying the full MFA-detect timeout.
+            otp_task = asyncio.create_task(
+                page.locator(OTP_SEL).wait_for(
+                    state="visible", timeout=TIMEOUT_MS_DEFAULT
+                )
             )
-        except PWTimeout:
-            pass
+            url_task = asyncio.create_task(
+                page.wait_for_url(
+                    _NOT_SIGN_IN_RE, timeout=TIMEOUT_MS_DEFAULT
+                )
+            )
+            err_task = asyncio.create_task(
+                page.locator(_LOGIN_ERROR_SELECTOR).first.wait_for(
+                    state="visible", timeout=TIMEOUT_MS_DEFAULT
+                )
+            )
+            done, pending = await asyncio.wait(
+                {otp_task, url_task, err_task},
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for t in pending:
+                t.cancel()
+            for t in done:
+                t.exception()  # retrieve to avoid warnings
 
-        # If URL moved away from /sign-in, assume success
-        if "/sign-in" not in page.url:
-            return {"status": "ok", "message": "Logged in", "url": page.url}
-
-        # Otherwise, inspect for inline error
-        for sel in [
-            ".css-oto7dz",
-            "[data-testid='error'], .error, .alert-danger",
-            "#email-field-wrapper.field-has-error",
-            "#password-field-wrapper.field-has-error",
-        ]:
-            loc = page.locator(sel).first
-            if await loc.is_visible():
+            if otp_task in done and otp_task.exception() is None:
+                return JSONResponse(
+                    content={"status": "mfa_required", "message": "MFA code requested"},
+                    status_code=202,
+                )
+
+            # If URL moved away from /sign-in, assume success
+            if "/sign-in" not in page.url:
+                return {"status": "ok", "message": "Logged in", "url": page.url}
+
+            # Otherwise, inspect for inline error
+            error_msg = await page.evaluate(
+                _VISIBLE_ERROR_JS, _LOGIN_ERROR_SELECTOR
+            )
+            if error_msg:
                 return JSONResponse(
                     content={
                         "status": "error",
-                        "message": await loc.inner_text(),
+                        "message": error_msg,
                         "url": page.url,
                     },
                     status_code=401,
                 )
 
-        # Still on /sign-in with no obvious error and no MFA UI—treat as pending
-        return JSONResponse(
-            content={
-                "status": "pending",
-                "message": "Awaiting server response (no MFA UI or redirect yet)",
-                "url": page.url,
-            },
-            status_code=202,
-        )
+            # Still on /sign-in with no obvious error and no MFA UI—treat as pending
+            return JSONResponse(
+                content={
+                    "status": "pending",
+                    "message": "Awaiting server response (no MFA UI or redirect yet)",
+                    "url": page.url,
+                },
+                status_code=202,
+            )
 
     except PlaywrightError as e:
         raise HTTPException(status_code=500, detail=f"Playwright error: {e}")
@@ -1032,54 +1599,66 @@ async def login_mfa(body: MfaBodyModel):
       - 401 + {status:"error"} if inline errors remain
     """
     try:
-        ctx = await get_ctx()
-        page = ctx.pages[0] if ctx.pages else await ctx.new_page()
-        page.on("popup", lambda p: asyncio.create_task(p.close()))
+        async with _borrow_auth_page() as page:
 
-        # If we're already away from /sign-in, treat as success
-        if "/sign-in" not in page.url:
-            return {"status": "ok", "message": "Already signed in", "url": page.url}
+            # If we're already away from /sign-in, treat as success
+            if "/sign-in" not in page.url:
+                return {"status": "ok", "message": "Already signed in", "url": page.url}
 
-        await page.locator("#otpCode-input").wait_for(
-            state="visible", timeout=body.timeout_ms
-        )
+            await page.locator(OTP_SEL).wait_for(
+                state="visible", timeout=body.timeout_ms
+            )
 
-        # Enter code
-        await page.fill("#otpCode-input", body.code)
+            # Enter code
+            await page.fill(OTP_SEL, body.code)
 
-        # Trust device checkbox (if present and requested)
-        if body.trust_device:
-            checkbox = page.locator('input[name="trustDevice"]')
-            if await checkbox.count() > 0:
-                if not await checkbox.is_checked():
-                    await checkbox.check()
+            # Trust device checkbox (if present and requested). check() is a
+            # no-op when already ticked; the short timeout stands in for the
+            # old count() existence probe.
+            if body.trust_device:
+                with contextlib.suppress(PWTimeout):
+                    await page.locator('input[name="trustDevice"]').check(
+                        timeout=1000
+                    )
 
-        # Click Sign In again
-        await page.locator("button.css-xdirqf").click()
+            # Click Sign In again
+            await page.locator(SIGNIN_BTN_SEL).click()
 
-        # Wait for URL to change away from /sign-in
-        try:
-            await page.wait_for_url(
-                lambda url: "/sign-in" not in url, timeout=body.timeout_ms
+            # Race the redirect against the inline error banner so a wrong
+            # code is answered as soon as it renders instead of after the
+            # full redirect timeout.
+            url_task = asyncio.create_task(
+                page.wait_for_url(_NOT_SIGN_IN_RE, timeout=body.timeout_ms)
+            )
+            err_task = asyncio.create_task(
+                page.locator(_MFA_ERROR_SELECTOR).first.wait_for(
+                    state="visible", timeout=body.timeout_ms
+                )
+            )
+            done, pending = await asyncio.wait(
+                {url_task, err_task}, return_when=asyncio.FIRST_COMPLETED
             )
-            return {"status": "ok", "message": "MFA accepted", "url": page.url}
-        except PWTimeout:
+            for t in pending:
+                t.cancel()
+            for t in done:
+                t.exception()  # retrieve to avoid warnings
+
+            if url_task in done and url_task.exception() is None:
+                return {"status": "ok", "message": "MFA accepted", "url": page.url}
+
             # Check for inline error messaging
-            for sel in [
-                ".css-oto7dz",
-                "[data-testid='error'], .error, .alert-danger",
-                "#otpCode-field-wrapper.field-has-error",
-            ]:
-                loc = page.locator(sel).first
-                if await loc.is_visible():
-                    return JSONResponse(
-                        content={
-                            "status": "error",
-                            "message": await loc.inner_text(),
-                            "url": page.url,
-                        },
-                        status_code=401,
-                    )
+            error_msg = await page.evaluate(
+                _VISIBLE_ERROR_JS, _MFA_ERROR_SELECTOR
+            )
+            if error_msg:
+                return JSONResponse(
+                    content={
+                        "status": "error",
+                        "message": error_msg,
+                        "url": page.url,
+                    },
+                    status_code=401,
+                )
             # Still no redirect—treat as pending
             return JSONResponse(
                 content={
@@ -1096,77 +1675,92 @@ async def login_mfa(body: MfaBodyModel):
         raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
 
 
-@app.get("/overdue-jobs")
-async def get_overdue_jobs(background_tasks: BackgroundTasks):
+# Concurrent identical export requests share one automation run instead of
+# racing each other on the shared context.
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+async def _coalesce(key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
     """
-    Trigger the automation, return the PDF file, and clean it up afterward.
+    Await the in-flight task for `key`, creating it from `factory` if none is
+    running. Because the PDF responses delete their file after streaming,
+    duplicate waiters get their own hard link to the result so each response
+    can clean up independently.
     """
-    result = await fetch_overdue_jobs()
+    task = _inflight.get(key)
+    owner = task is None or task.done()
+    if owner:
+        task = asyncio.create_task(factory())
+        _inflight[key] = task
+        # Only evict our own entry: a callback can fire after a newer task
+        # has already replaced this one under the same key.
+        def _evict(t, key=key):
+            if _inflight.get(key) is t:
+                _inflight.pop(key, None)
+
+        task.add_done_callback(_evict)
+
+    result = await asyncio.shield(task)
+
+    if not owner and isinstance(result, tuple):
+        pdf_path, filename = result
+        dup_path = f"{pdf_path}.{uuid.uuid4().hex}"
+        os.link(pdf_path, dup_path)
+        return dup_path, filename
+    return result
 
-    if isinstance(result, dict):
-        return JSONResponse(content=result, status_code=500)
 
-    pdf_path: str = result
-    background_tasks.add_task(safe_remove, pdf_path)
+def _pdf_response(result: Union[Tuple[str, str], str]):
+    """Map a fetch_*_jobs result onto the streaming/204 responses.
 
-    if pdf_path == "":
+    Failures surface as ScrapeError out of the fetchers and never reach
+    here; FastAPI's exception handler serializes them.
+    """
+    if result == "":
         return JSONResponse(content={"message": "no rows found"}, status_code=204)
 
-    return FileResponse(
-        pdf_path,
+    pdf_path, filename = result
+    return StreamingResponse(
+        _stream_and_remove(pdf_path),
         media_type="application/pdf",
-        filename=os.path.basename(pdf_path),
-        background=background_tasks,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
+@app.get("/overdue-jobs")
+async def get_overdue_jobs():
+    """
+    Trigger the automation and stream the PDF back, cleaning it up afterward.
+    """
+    return _pdf_response(await _coalesce("overdue", fetch_overdue_jobs))
+
+
 @app.get("/pending-jobs")
-async def get_pending_jobs(
-    background_tasks: BackgroundTasks,
-    filters_model: JobFiltersModel = Depends(),
-):
+async def get_pending_jobs(filters_model: JobFiltersModel = Depends()):
     filters: JobFilters = {}
     if filters_model.sales_rep is not None:
         filters["sales_rep"] = filters_model.sales_rep
 
-    result = await fetch_pending_jobs(filters)
-
-    if isinstance(result, dict):
-        return JSONResponse(content=result, status_code=500)
-
-    pdf_path: str = result
-    if pdf_path == "":
-        return JSONResponse(content={"message": "no rows found"}, status_code=204)
-
-    background_tasks.add_task(safe_remove, pdf_path)
-    return FileResponse(
-        pdf_path,
-        media_type="application/pdf",
-        filename=os.path.basename(pdf_path),
-        background=background_tasks,
-    )
+    key = f"pending:{filters.get('sales_rep', '')}"
+    return _pdf_response(await _coalesce(key, lambda: fetch_pending_jobs(filters)))
 
 
 @app.get("/login/sanmar")
 async def login_sanmar():
     try:
-        ctx = await get_ctx()
-        page = await ctx.new_page()
-        page.on("popup", lambda p: asyncio.create_task(p.close()))
+        async with acquire_page() as page:
+            await page.goto(
+                URL_SANMAR, wait_until="domcontentloaded")
 
-        await page.goto(
-            URL_SANMAR, wait_until="domcontentloaded")
+            await page.fill("#username", SANMAR_USERNAME)
+            await page.fill("#password", SANMAR_PASSWORD)
+            await page.locator("input.form-check-input").click()
 
-        await page.fill("#username", SANMAR_USERNAME)
-        await page.fill("#password", SANMAR_PASSWORD)
-        await page.locator("input.form-check-input").click()
+            await page.locator(
+                "button.btn-df.btn-primary-df.btn-sm-df.text-nowrap.d-none.d-lg-inline-block"
+            ).click()
 
-        await page.locator(
-            "button.btn-df.btn-primary-df.btn-sm-df.text-nowrap.d-none.d-lg-inline-block"
-        ).click()
-
-        await page.wait_for_load_state("networkidle")
-        await page.close()
+            await page.wait_for_load_state("networkidle")
 
         return JSONResponse(
             content={
@@ -1182,10 +1776,8 @@ async def login_sanmar():
 
 @app.get("/login/ss")
 async def login_ss():
-    ctx = await get_ctx()
-    page = await ctx.new_page()
-    await s_and_s.login(page)
-    await page.close()
+    async with acquire_page() as page:
+        await s_and_s.login(page)
 
     return JSONResponse(
         content={
@@ -1197,11 +1789,8 @@ async def login_ss():
 
 @app.get("/ss/accept-cookies")
 async def ss_accept_cookies():
-    
-    ctx = await get_ctx()
-    page = await ctx.new_page()
-    await s_and_s.accept_cookies(page)
-    await page.close()
+    async with acquire_page() as page:
+        await s_and_s.accept_cookies(page)
 
     return JSONResponse(
         content={
@@ -1215,14 +1804,14 @@ async def get_to_order_so():
 
     result = await fetch_to_order_so()
     if len(result) <= 0:
-        return JSONResponse(content={"message": "no rows found"}, status_code=204)
-    return JSONResponse(content={"result": result}, status_code=200)
+        return ORJSONResponse(content={"message": "no rows found"}, status_code=204)
+    return ORJSONResponse(content={"result": result}, status_code=200)
 
 
 @app.post("/add-to-cart")
 async def add_to_cart_r(orders: List[SalesOrder]):
     result = await add_to_cart(orders)
-    return JSONResponse(content={"result": result}, status_code=200)
+    return ORJSONResponse(content={"result": result}, status_code=200)
 
 @app.post("/update-so-tag-ordered")
 async def update_so_tag(orders: List[str]):
@@ -1234,6 +1823,7 @@ async def update_so_tag(orders: List[str]):
     return JSONResponse(content={"message": "Updated"}, status_code=200)
 
 
-@app.get("/")
+@app.get("/", status_code=204)
 async def hello():
-    return {"time": datetime.datetime.now().isoformat()}
+    # Health probe; no body means no per-ping datetime/JSON allocation.
+    return Response(status_code=204)
@@ -0,0 +1,9 @@
+#!/bin/sh
+# Launch one shared Chromium for all API workers to attach to via
+# PW_CDP_ENDPOINT=http://localhost:9222 (see main.py).
+exec google-chrome \
+    --remote-debugging-port="${CDP_PORT:-9222}" \
+    --user-data-dir="${PW_USER_DATA_DIR:?PW_USER_DATA_DIR is required}" \
+    --headless=new \
+    --no-first-run \
+    --no-default-browser-check
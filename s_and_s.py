@@ -1,33 +1,30 @@
-import re
 from typing import List, Tuple
 
-from dotenv import load_dotenv
 from playwright.async_api import Page
 
-from helpers import _click_and_wait_domcontent, require_env
+from config import S_AND_S_PASSWORD, S_AND_S_USERNAME, URL_S_AND_S
+from helpers import FILL_PLAN_JS, _click_and_wait_domcontent
 from schemas import Item, SizeItem
 
-load_dotenv()
-URL_S_AND_S = "https://www.ssactivewear.com"
 
-
-S_AND_S_USERNAME = require_env("S_AND_S_USERNAME")
-S_AND_S_PASSWORD = require_env("S_AND_S_PASSWORD")
+# Hot selectors, built once. Locators resolve lazily so caching element
+# handles buys nothing and goes stale on navigation; sharing the strings
+# keeps every call site pointing at the same markup.
+_SEL_PROFILE_WRAPPER = "#M_M_zOrderProfileWrapper"
+_SEL_GRID = "#M_M_zGrid"
+_SEL_GRID_ROWS = "#M_M_zGrid .gR[id^='wh_']"
+_SEL_SEARCH_TB = "input[name='M$zSearchTBNew']"
+_SEL_SEARCH_BTN = "input[name='M$zSearchBTNNew']"
 
 
 # --- helpers ---------------------------------------------------------------
-def _parse_int(text: str) -> int:
-    digits = re.sub(r"[^\d]", "", text or "")
-    return int(digits) if digits else 0
-
-
 async def _ensure_warehouse_view(page: Page) -> None:
     """
     S&S uses a custom view switcher, not a <select>. Click to open and pick "Warehouse View".
     Safe to call repeatedly.
     """
     # Wrapper exists on desktop
-    wrapper = page.locator("#M_M_zOrderProfileWrapper")
+    wrapper = page.locator(_SEL_PROFILE_WRAPPER)
     if not await wrapper.count():
         return  # mobile or already correct; proceed
 
@@ -42,60 +39,55 @@ async def _ensure_warehouse_view(page: Page) -> None:
 
 
 async def _wait_for_grid(page: Page) -> None:
-    await page.locator("#M_M_zGrid").wait_for(state="visible", timeout=15000)
-    await page.locator("#M_M_zGrid .gR[id^='wh_']").first.wait_for(
+    await page.locator(_SEL_GRID).wait_for(state="visible", timeout=15000)
+    await page.locator(_SEL_GRID_ROWS).first.wait_for(
         state="visible", timeout=15000
     )
 
 
-async def _get_size_order(page: Page) -> List[str]:
-    spans = await page.locator("#M_M_zGrid .gH span").all_text_contents()
-    order = [s.strip() for s in spans if s.strip()]
-    return [s for s in order if s.lower() != "color"]
+# Snapshot the whole warehouse grid in one evaluate instead of a
+# count()/inner_text()/count() round-trip per (row, size) cell. The
+# implementation lives in the context init script scripts/scrape_helpers.js;
+# each qty input gets a data-fill-id attribute so the fill step can address
+# it directly without re-walking the grid.
+_GRID_SNAPSHOT_JS = "() => window.__svScrape.ssGrid()"
 
 
 async def _fill_sizes_across_warehouses(
     page: Page, sizes: List["SizeItem"]
 ) -> Tuple[bool, List[str]]:
     any_added = False
-    oos: List[str] = []
+    oos: List[str] = [None] * len(sizes)
 
-    size_order = await _get_size_order(page)
-    rows = page.locator("#M_M_zGrid .gR[id^='wh_']")
-    row_count = await rows.count()
-    if row_count == 0:
+    snapshot = await page.evaluate(_GRID_SNAPSHOT_JS)
+    size_order: List[str] = snapshot["sizes"]
+    grid = snapshot["grid"]
+    if not grid:
         return False, [s.size for s in sizes]
 
-    for si in sizes:
-        requested = int(si.quantity)
+    col_of = {s: i for i, s in enumerate(size_order)}
+    plan: List[Tuple[str, str]] = []
+
+    for i, si in enumerate(sizes):
+        requested = si.quantity
         remaining = requested
 
-        if si.size not in size_order:
-            oos.append(si.size)
+        col_index = col_of.get(si.size)
+        if col_index is None:
+            oos[i] = si.size
             continue
 
-        col_index = size_order.index(si.size)
-
-        for r in range(row_count):
-            cell = rows.nth(r).locator("div.i").nth(col_index)
-
-            if await cell.count() == 0:
+        for row in grid:
+            cell = row[col_index] if col_index < len(row) else None
+            if cell is None:
                 continue
 
-            cell_text = (await cell.inner_text()) or ""
-            nums = re.findall(r"\d[\d,]*", cell_text)
-            available = _parse_int(nums[-1]) if nums else 0
-            if available <= 0 or remaining <= 0:
+            available, fill_id = cell
+            if available <= 0 or remaining <= 0 or fill_id is None:
                 continue
 
             take = min(remaining, available)
-
-            qty_input = cell.locator("input[aria-label='quantity']")
-            if await qty_input.count() == 0:
-                continue
-
-            await qty_input.scroll_into_view_if_needed()
-            await qty_input.fill(str(take))
+            plan.append((f"input[data-fill-id='{fill_id}']", str(take)))
 
             remaining -= take
             any_added = True
@@ -104,15 +96,18 @@ async def _fill_sizes_across_warehouses(
 
         if remaining > 0:
             # Not fully satisfied across all warehouses
-            oos.append(si.size)
+            oos[i] = si.size
 
-    return any_added, oos
+    if plan:
+        await page.evaluate(FILL_PLAN_JS, plan)
+
+    return any_added, [s for s in oos if s is not None]
 
 
 async def process_item(page: Page, item: Item) -> Tuple[bool, List[str]]:
 
     await search_item(page, item)
-    await page.wait_for_load_state("load")
+    await page.wait_for_load_state("domcontentloaded")
 
     await choose_color(page, item)
 
@@ -138,11 +133,9 @@ async def accept_cookies(page: Page):
     await page.set_viewport_size({"width": 1366, "height": 900})
     await page.context.set_extra_http_headers({"Accept-Language": "en-US,en;q=0.9"})
 
-    await page.goto(URL_S_AND_S)
-    await page.wait_for_load_state("load")
-
-    html = await page.content()
-    print(html)
+    # The click below auto-waits for the banner button, so DOMContentLoaded
+    # is all the navigation gate we need.
+    await page.goto(URL_S_AND_S, wait_until="domcontentloaded")
     await page.locator("button#onetrust-accept-btn-handler").click()
 
 
@@ -151,7 +144,11 @@ async def login(page: Page):
     await page.set_viewport_size({"width": 1366, "height": 900})
     await page.context.set_extra_http_headers({"Accept-Language": "en-US,en;q=0.9"})
 
-    await page.goto(URL_S_AND_S + "/myaccount/login")
+    await page.goto(URL_S_AND_S + "/myaccount/login", wait_until="domcontentloaded")
+    # Session cookies usually survive in the persistent context; skip the
+    # credential dance when the login form never renders.
+    if not await page.locator("input#M_M_zEmailTB").count():
+        return
     await page.locator("input#M_M_zEmailTB").fill(S_AND_S_USERNAME)
     await page.locator("input#M_M_zPasswordTB").fill(S_AND_S_PASSWORD)
     await page.locator("input#M_M_zPageLoginBTN").click()
@@ -162,16 +159,19 @@ async def home(page: Page):
 
 
 async def search_item(page: Page, item: Item) -> None:
-    await page.locator("input[name='M$zSearchTBNew']").fill(item.part)
-    search = page.locator("input[name='M$zSearchBTNNew']")
+    await page.locator(_SEL_SEARCH_TB).fill(item.part)
+    search = page.locator(_SEL_SEARCH_BTN)
     await _click_and_wait_domcontent(page, search)
     product_a_tag = page.locator("a#gLink0")
     product_href = await product_a_tag.get_attribute("href")
-    if product_href:
-        await page.goto(
-            URL_S_AND_S + product_href,
-            wait_until="domcontentloaded",
-        )
+    if not product_href:
+        return
+
+    # One-hit searches land straight on the product page; don't pay a
+    # second navigation when we are already there.
+    product_url = URL_S_AND_S + product_href
+    if page.url != product_url:
+        await page.goto(product_url, wait_until="domcontentloaded")
 
 
 async def choose_color(page: Page, item: Item) -> None:
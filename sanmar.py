@@ -1,15 +1,53 @@
-import re
 from typing import Dict, List, Tuple
 
-from dotenv import load_dotenv
-from playwright.async_api import Locator, Page
+from playwright.async_api import Page
+from playwright.async_api import TimeoutError as PWTimeout
 
-from helpers import _click_and_wait_domcontent
+from config import URL_SANMAR
+from helpers import FILL_PLAN_JS, _click_and_wait_domcontent
 from schemas import Item, SizeItem
 
-load_dotenv()
-
-URL_SANMAR = "https://sanmar.com"
+# Hot selectors, built once and shared across call sites. Locators resolve
+# lazily, so constants (not cached element handles) are the right unit here.
+_SEL_INVENTORY_HEADERS = (
+    "table.table-inventory.table-inventory-next thead th.size-header"
+)
+_SEL_SEARCH_INPUT = (
+    'input#main-search[placeholder="Search by Product, Style Number, or Category"]'
+)
+_SEL_SEARCH_BTN = "button[aria-label='Search']"
+_SEL_ADD_TO_BASKET = "button.btn.btn-primary.btn-add-to-basket"
+
+# Size alias groups, flattened once at import into a label -> variants map so
+# normalization is a dict lookup instead of a per-call table rebuild.
+_SIZE_ALIAS_GROUPS = {
+    "XS": {"XSM", "X-SMALL"},
+    "S": {"SM", "SMALL"},
+    "M": {"MED", "MEDIUM"},
+    "L": {"LG", "LARGE"},
+    "XL": {"X-LARGE", "XLG"},
+    "2XL": {"XXL", "2X-LARGE"},
+    "3XL": {"XXXL", "3X-LARGE"},
+    "4XL": {"XXXXL", "4X-LARGE"},
+    "5XL": {"XXXXXL", "5X-LARGE"},
+    "6XL": {"XXXXXXL", "6X-LARGE"},
+    "7XL": {"XXXXXXXL", "7X-LARGE"},
+    "8XL": {"XXXXXXXXL", "8X-LARGE"},
+    "9XL": {"XXXXXXXXXL", "9X-LARGE"},
+    "ONE SIZE": {"OS", "OSFA"},
+    "OSFA": {"ONE SIZE", "OS"},
+}
+
+_SIZE_VARIANTS: Dict[str, frozenset] = {}
+for _key, _alts in _SIZE_ALIAS_GROUPS.items():
+    _group = frozenset({_key} | _alts)
+    for _label in _group:
+        _SIZE_VARIANTS[_label] = _SIZE_VARIANTS.get(_label, frozenset()) | _group
+
+
+def normalize_size(label: str) -> List[str]:
+    u = (label or "").strip().upper()
+    return list(_SIZE_VARIANTS.get(u, frozenset()) | {u})
 
 
 async def process_item(page: Page, item: Item) -> Tuple[bool, List[str]]:
@@ -22,94 +60,24 @@ async def home(page: Page):
     await page.goto(URL_SANMAR, wait_until="domcontentloaded")
 
 
+# One DOM traversal for the whole inventory grid — a protocol round-trip per
+# count()/inner_text()/get_attribute() otherwise. The implementation lives in
+# the context init script scripts/scrape_helpers.js; each usable input gets a
+# data-sv-fill attribute so Python can address it in O(1) later.
+_SIZE_GRID_JS = "() => window.__svScrape.sanmarGrid()"
+
+
 async def build_size_inputs_by_warehouse(
     page: Page,
-) -> Dict[str, List[Tuple[str, Locator, int]]]:
-    await page.wait_for_selector(
-        "table.table-inventory.table-inventory-next", timeout=15000
-    )
-    await page.wait_for_selector(
-        "table.table-inventory.table-inventory-next thead th.size-header",
-        timeout=15000,
-    )
-
-    size_to_entries: Dict[str, List[Tuple[str, Locator, int]]] = {}
-
-    tables = page.locator("table.table-inventory.table-inventory-next")
-    tcount = await tables.count()
-
-    for t_idx in range(tcount):
-        table = tables.nth(t_idx)
-
-        # Scope all queries to this table only
-        headers = table.locator(":scope thead th.size-header")
-        rows = table.locator(":scope tr.default.warehouse-list")
-
-        hcount = await headers.count()
-        rcount = await rows.count()
-        if hcount == 0 or rcount == 0:
-            continue  # nothing to do on this table
-
-        # Pre-read header labels to keep alignment with data-col-tracker
-        header_labels: List[str] = []
-        for h_idx in range(hcount):
-            try:
-                raw = (await headers.nth(h_idx).inner_text()).strip()
-            except Exception:
-                raw = ""
-            header_labels.append(raw)
-
-        # Walk rows (warehouses)
-        for r_idx in range(rcount):
-            row = rows.nth(r_idx)
-
-            # Warehouse name (best-effort)
-            wh_name = "Warehouse"
-            try:
-                wh_el = row.locator(":scope .warehouse-city").first
-                if await wh_el.count() > 0:
-                    wh_name = (await wh_el.inner_text() or "").strip() or wh_name
-            except Exception:
-                pass
-
-            # For each size column, find the matching <td> and its input/stock
-            for h_idx, raw_label in enumerate(header_labels):
-                if not raw_label:
-                    continue
-
-                size_key = raw_label.strip().upper()
-
-                td = row.locator(f":scope td[data-col-tracker='{h_idx}']")
-                if await td.count() == 0:
-                    continue
-
-                input_field = td.locator(":scope input.form-control").first
-                if await input_field.count() == 0:
-                    # no input for this size/warehouse
-                    continue
-
-                # Read stock: prefer visible span, fallback to input data-available
-                available_qty = 0
-                try:
-                    stock_span = td.locator(":scope span.stock-available").first
-                    if await stock_span.count() > 0:
-                        txt = (await stock_span.inner_text() or "").strip()
-                        available_qty = int(re.sub(r"\D", "", txt) or "0")
-                except Exception:
-                    pass
-
-                if available_qty == 0:
-                    try:
-                        data_avail = await input_field.get_attribute("data-available")
-                        if data_avail is not None:
-                            available_qty = int(re.sub(r"\D", "", data_avail) or "0")
-                    except Exception:
-                        pass
-
-                # Record the entry regardless of availability (we'll decide later)
-                size_to_entries.setdefault(size_key, []).append(
-                    (wh_name, input_field, available_qty)
-                )
+) -> Dict[str, List[Tuple[str, int, int, bool]]]:
+    await page.wait_for_selector(_SEL_INVENTORY_HEADERS, timeout=15000)
+
+    size_to_entries: Dict[str, List[Tuple[str, int, int, bool]]] = {}
+
+    for entry in await page.evaluate(_SIZE_GRID_JS):
+        size_to_entries.setdefault(entry["size"], []).append(
+            (entry["wh"], entry["fid"], entry["avail"], entry["disabled"])
+        )
 
     if len(size_to_entries) == 1:
         only_key = next(iter(size_to_entries.keys()))
@@ -121,9 +89,7 @@ async def build_size_inputs_by_warehouse(
 
 
 async def fill_search(page: Page, style_number: str):
-    search_inputs = page.locator(
-        'input#main-search[placeholder="Search by Product, Style Number, or Category"]'
-    )
+    search_inputs = page.locator(_SEL_SEARCH_INPUT)
     scount = await search_inputs.count()
     if scount == 0:
         search_inputs = page.locator('input[aria-label*="Search"]')
@@ -136,7 +102,7 @@ async def fill_search(page: Page, style_number: str):
     await target.fill("")
     await target.fill(style_number)
 
-    search_buttons = page.locator("button[aria-label='Search']")
+    search_buttons = page.locator(_SEL_SEARCH_BTN)
     bcount = await search_buttons.count()
 
     if bcount == 1:
@@ -178,39 +144,15 @@ async def add_requested_sizes(
         size_entries = await build_size_inputs_by_warehouse(page)
 
     added_any = False
-    oos_sizes: List[str] = []
-
-    def normalize_size(label: str) -> List[str]:
-        u = (label or "").strip().upper()
-        variants = {u}
-        alt = {
-            "XS": {"XSM", "X-SMALL"},
-            "S": {"SM", "SMALL"},
-            "M": {"MED", "MEDIUM"},
-            "L": {"LG", "LARGE"},
-            "XL": {"X-LARGE", "XLG"},
-            "2XL": {"XXL", "2X-LARGE"},
-            "3XL": {"XXXL", "3X-LARGE"},
-            "4XL": {"XXXXL", "4X-LARGE"},
-            "5XL": {"XXXXXL", "5X-LARGE"},
-            "6XL": {"XXXXXXL", "6X-LARGE"},
-            "7XL": {"XXXXXXXL", "7X-LARGE"},
-            "8XL": {"XXXXXXXXL", "8X-LARGE"},
-            "9XL": {"XXXXXXXXXL", "9X-LARGE"},
-            "ONE SIZE": {"OS", "OSFA"},
-            "OSFA": {"ONE SIZE", "OS"},
-        }
-        for k, v in alt.items():
-            if u == k or u in v:
-                variants |= {k} | v
-        return list(variants)
-
-    for s in sizes:
+    oos_sizes: List[str] = [None] * len(sizes)
+    plan: List[Tuple[str, str]] = []
+
+    for i, s in enumerate(sizes):
         # sanitize
-        if not s or s.quantity is None or int(s.quantity or 0) <= 0:
+        if not s or s.quantity <= 0:
             continue
 
-        target_qty = int(s.quantity)
+        target_qty = s.quantity
         remaining = target_qty
         candidates = normalize_size(str(s.size or ""))
 
@@ -218,51 +160,40 @@ async def add_requested_sizes(
         size_key = next((c for c in candidates if c in size_entries), None)
         if not size_key:
             # no matching column → treat as OOS for this page
-            oos_sizes.append(str(s.size))
+            oos_sizes[i] = str(s.size)
             continue
 
-        # size_entries[size_key] -> List[Tuple[warehouse_name: str, input: Locator, available_qty: int]]
-        for wh_name, input_field, available_qty in size_entries[size_key]:
+        # size_entries[size_key] -> List[Tuple[warehouse, fill_id, available, disabled]]
+        for wh_name, fill_id, available_qty, disabled in size_entries[size_key]:
             if remaining <= 0:
                 break
 
-            # skip disabled/zero
-            try:
-                if await input_field.is_disabled():
-                    continue
-            except Exception:
-                try:
-                    if (await input_field.get_attribute("disabled")) is not None:
-                        continue
-                except Exception:
-                    pass
-
-            if available_qty <= 0:
+            if disabled or available_qty <= 0:
                 continue
 
             to_take = min(available_qty, remaining)
-            try:
-                await input_field.wait_for(state="visible", timeout=5000)
-                await input_field.scroll_into_view_if_needed()
-                await input_field.fill("")  # clear first
-                await input_field.fill(str(to_take))  # then type
-                added_any = True
-                remaining -= to_take
-            except Exception:
-                # if this cell fails, try next warehouse cell
-                continue
+            plan.append((f'input[data-sv-fill="{fill_id}"]', str(to_take)))
+            added_any = True
+            remaining -= to_take
 
         if remaining > 0:
-            oos_sizes.append(str(s.size))
+            oos_sizes[i] = str(s.size)
 
-    await page.wait_for_timeout(300)
+    if plan:
+        await page.evaluate(FILL_PLAN_JS, plan)
 
     if added_any:
-        add_to_cart_button = page.locator(
-            "button.btn.btn-primary.btn-add-to-basket"
-        ).first
+        # The visibility wait on the button already gates the click; after it,
+        # wait for the cart request to land instead of sleeping a fixed 500ms.
+        add_to_cart_button = page.locator(_SEL_ADD_TO_BASKET).first
         await add_to_cart_button.wait_for(state="visible", timeout=7000)
-        await add_to_cart_button.click()
-        await page.wait_for_timeout(500)
-
-    return added_any, oos_sizes
+        try:
+            async with page.expect_response(
+                lambda r: "cart" in r.url.lower() and r.status < 400,
+                timeout=5000,
+            ):
+                await add_to_cart_button.click()
+        except PWTimeout:
+            pass
+
+    return added_any, [s for s in oos_sizes if s is not None]
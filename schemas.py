@@ -1,9 +1,8 @@
-import os
 from typing import List, TypedDict
 
-from pydantic import BaseModel
+from pydantic import BaseModel, NonNegativeInt
 
-TIMEOUT_MS_DEFAULT = int(os.getenv("SHOPVOX_TIMEOUT_MS", "15000"))
+from config import TIMEOUT_MS_DEFAULT
 
 
 class JobFilters(TypedDict, total=False):
@@ -22,7 +21,9 @@ class MfaBodyModel(BaseModel):
 
 class SizeItem(BaseModel):
     size: str
-    quantity: float
+    # Validated to a whole count at the API boundary so the fill loops can
+    # use it directly instead of casting per cell.
+    quantity: NonNegativeInt
 
 
 class Item(BaseModel):
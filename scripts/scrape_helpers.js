@@ -0,0 +1,93 @@
+// Shared DOM helpers injected once per context (see _launch_context /
+// new_order_context in main.py). Keeping them resident lets V8 reuse the
+// compiled functions and shrinks each evaluate message to a one-line call
+// instead of shipping the full source per invocation.
+window.__svScrape = {
+    // SanMar inventory grid: one traversal, tagging each usable input with
+    // data-sv-fill so Python can address it in O(1) later.
+    sanmarGrid() {
+        const out = [];
+        let fid = 0;
+        for (const table of document.querySelectorAll(
+                'table.table-inventory.table-inventory-next')) {
+            const headers = Array.from(
+                table.querySelectorAll('thead th.size-header'),
+                th => (th.innerText || '').trim());
+            for (const row of table.querySelectorAll(
+                    'tr.default.warehouse-list')) {
+                const whEl = row.querySelector('.warehouse-city');
+                const wh = (whEl && whEl.innerText.trim()) || 'Warehouse';
+                headers.forEach((label, i) => {
+                    if (!label) return;
+                    const td = row.querySelector(
+                        `td[data-col-tracker='${i}']`);
+                    if (!td) return;
+                    const input = td.querySelector('input.form-control');
+                    if (!input) return;
+                    input.setAttribute('data-sv-fill', String(fid));
+                    let avail = 0;
+                    const span = td.querySelector('span.stock-available');
+                    if (span)
+                        avail = parseInt(
+                            (span.innerText || '').replace(/\D/g, ''), 10) || 0;
+                    if (!avail) {
+                        const da = input.getAttribute('data-available');
+                        if (da !== null)
+                            avail = parseInt(da.replace(/\D/g, ''), 10) || 0;
+                    }
+                    out.push({size: label.toUpperCase(), wh, fid, avail,
+                              disabled: input.disabled});
+                    fid += 1;
+                });
+            }
+        }
+        return out;
+    },
+
+    // S&S warehouse grid: header order plus an (available, fill id) matrix,
+    // tagging each quantity input with data-fill-id.
+    ssGrid() {
+        const headers = Array.from(
+            document.querySelectorAll('#M_M_zGrid .gH span'),
+            s => (s.innerText || '').trim()
+        ).filter(s => s && s.toLowerCase() !== 'color');
+        const grid = [];
+        let fid = 0;
+        for (const row of document.querySelectorAll(
+                "#M_M_zGrid .gR[id^='wh_']")) {
+            const cells = row.querySelectorAll('div.i');
+            const rowOut = [];
+            headers.forEach((_, i) => {
+                const cell = cells[i];
+                if (!cell) { rowOut.push(null); return; }
+                const nums = (cell.innerText || '').match(/\d[\d,]*/g);
+                const avail = nums
+                    ? parseInt(nums[nums.length - 1].replace(/,/g, ''), 10)
+                    : 0;
+                const input = cell.querySelector(
+                    "input[aria-label='quantity']");
+                let id = null;
+                if (input) {
+                    input.setAttribute('data-fill-id', String(fid));
+                    id = fid;
+                    fid += 1;
+                }
+                rowOut.push([avail, id]);
+            });
+            grid.push(rowOut);
+        }
+        return {sizes: headers, grid};
+    },
+
+    // Apply a list of (selector, value) pairs in one call; the input/change
+    // events keep framework listeners on those fields in sync.
+    batchFill(plan) {
+        for (const [sel, val] of plan) {
+            const el = document.querySelector(sel);
+            if (!el) continue;
+            el.value = val;
+            el.dispatchEvent(new Event('input', {bubbles: true}));
+            el.dispatchEvent(new Event('change', {bubbles: true}));
+        }
+    },
+};